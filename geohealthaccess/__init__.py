@@ -1,5 +1,17 @@
 import logging
 
+import geopandas as gpd
+
+try:
+    # Use the pyogrio engine for vector I/O when available: it fetches
+    # features in batches through the OGR C API and is typically several
+    # times faster than the default fiona engine on GeoJSON and GPKG.
+    import pyogrio  # noqa: F401
+
+    gpd.options.io_engine = "pyogrio"
+except (ImportError, AttributeError):
+    pass
+
 
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
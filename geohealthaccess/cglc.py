@@ -147,7 +147,9 @@ class CGLC:
         log.info(f"{len(tiles)} CGLC tiles required to cover the area of interest.")
         return list(tiles)
 
-    def download(self, tile, output_dir, show_progress=True, overwrite=False):
+    def download(
+        self, tile, output_dir, show_progress=True, overwrite=False, pbar_position=0
+    ):
         """Download a CGLC tile.
 
         Parameters
@@ -160,6 +162,9 @@ class CGLC:
             Show download progress bar.
         overwrite : bool, optional
             Force overwrite of existing files.
+        pbar_position : int, optional
+            Absolute position of the progress bar in case several
+            downloads run concurrently.
 
         Returns
         -------
@@ -168,7 +173,7 @@ class CGLC:
         """
         url = self.sindex.url[tile]
         return download_from_url(
-            self.session, url, output_dir, show_progress, overwrite
+            self.session, url, output_dir, show_progress, overwrite, pbar_position
         )
 
     def download_size(self, tile):
@@ -241,8 +246,8 @@ def unique_tiles(directory):
     list of str
         List of unique tile IDs.
     """
-    files = [f for f in os.listdir(directory) if _is_cglc(f)]
-    tiles = [f.split("_")[0] for f in files]
+    with os.scandir(directory) as entries:
+        tiles = [e.name.split("_")[0] for e in entries if _is_cglc(e.name)]
     unique = list(set(tiles))
     log.info(f"Found {len(unique)} unique CGLC tiles.")
     return unique
@@ -263,8 +268,12 @@ def list_layers(directory, tile):
     list of str
         List of layer names.
     """
-    files = [f for f in os.listdir(directory) if _is_cglc(f) and f.startswith(tile)]
-    return [f.split("_")[6] for f in files]
+    with os.scandir(directory) as entries:
+        return [
+            e.name.split("_")[6]
+            for e in entries
+            if _is_cglc(e.name) and e.name.startswith(tile)
+        ]
 
 
 def find_layer(directory, tile, name):
@@ -284,9 +293,11 @@ def find_layer(directory, tile, name):
     str
         Path to CGLC layer.
     """
-    files = [f for f in os.listdir(directory) if _is_cglc(f)]
-    for f in files:
-        if f.startswith(tile) and f.split("_")[6] == name:
-            return os.path.join(directory, f)
+    with os.scandir(directory) as entries:
+        for e in entries:
+            if not _is_cglc(e.name) or not e.name.startswith(tile):
+                continue
+            if e.name.split("_")[6] == name:
+                return e.path
     log.warning(f"Layer {name} not found.")
     return None
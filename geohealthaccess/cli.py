@@ -44,12 +44,12 @@ from geohealthaccess.modeling import (
 )
 from geohealthaccess.osm import thematic_extract, create_water_raster
 from geohealthaccess.preprocessing import (
+    build_overviews,
+    build_vrt,
     compute_aspect,
     compute_slope,
-    concatenate_bands,
     create_grid,
     mask_raster,
-    merge_tiles,
     reproject,
 )
 from geohealthaccess.srtm import SRTM
@@ -117,21 +117,31 @@ def download(country, output_dir, earthdata_user, earthdata_pass, overwrite):
     # Land Cover
     cglc = CGLC()
     tiles = cglc.search(geom)
-    for tile in tiles:
-        cglc.download(tile, os.path.join(output_dir, NAMES[1]), overwrite=overwrite)
+    dst_dir = os.path.join(output_dir, NAMES[1])
+    with ThreadPoolExecutor(max_workers=5) as e:
+        futures = [
+            e.submit(cglc.download, tile, dst_dir, True, overwrite, i)
+            for i, tile in enumerate(tiles)
+        ]
+        for future in futures:
+            future.result()
 
     # OpenStreetMap
     geofab = Geofabrik()
     region_id, _ = geofab.search(geom)
     geofab.download(region_id, os.path.join(output_dir, NAMES[2]), overwrite=overwrite)
 
-    # Global Surface WaterTrue
+    # Global Surface Water
     gsw = GSW()
     tiles = gsw.search(geom)
-    for tile in tiles:
-        gsw.download(
-            tile, "seasonality", os.path.join(output_dir, NAMES[3]), overwrite=overwrite
-        )
+    dst_dir = os.path.join(output_dir, NAMES[3])
+    with ThreadPoolExecutor(max_workers=5) as e:
+        futures = [
+            e.submit(gsw.download, tile, "seasonality", dst_dir, True, overwrite, i)
+            for i, tile in enumerate(tiles)
+        ]
+        for future in futures:
+            future.result()
 
     # Digital elevation model
     srtm = SRTM()
@@ -139,10 +149,12 @@ def download(country, output_dir, earthdata_user, earthdata_pass, overwrite):
     tiles = srtm.search(geom)
     dst_dir = os.path.join(output_dir, NAMES[4])
     with ThreadPoolExecutor(max_workers=5) as e:
-        for i, tile in enumerate(tiles):
-            e.submit(
-                srtm.download, tile, dst_dir, True, overwrite, i,
-            )
+        futures = [
+            e.submit(srtm.download, tile, dst_dir, True, overwrite, i)
+            for i, tile in enumerate(tiles)
+        ]
+        for future in futures:
+            future.result()
 
 
 @cli.command()
@@ -162,6 +174,21 @@ def download(country, output_dir, earthdata_user, earthdata_pass, overwrite):
 )
 def preprocess(input_dir, output_dir, crs, resolution, country, overwrite):
     """Preprocess and co-register input datasets."""
+    # GDAL cache and I/O tuning: a larger block cache avoids re-reads during
+    # warping and masking, VSI caching buffers filesystem reads, and skipping
+    # the directory scan on open avoids sidecar probes when opening thousands
+    # of tiles. Set through os.environ (not rasterio.Env) so the settings are
+    # inherited by the gdalwarp/gdalbuildvrt child processes; setdefault keeps
+    # user-provided values in charge.
+    gdal_env = {
+        "GDAL_CACHEMAX": "2048",
+        "VSI_CACHE": "TRUE",
+        "VSI_CACHE_SIZE": str(512 * 1024 ** 2),
+        "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    }
+    for key, value in gdal_env.items():
+        os.environ.setdefault(key, value)
+
     # Set data directories if not provided and create them if necessary
     if not input_dir:
         input_dir = os.path.join(os.curdir, "Data", "Input")
@@ -184,32 +211,112 @@ def preprocess(input_dir, output_dir, crs, resolution, country, overwrite):
     }
 
     raw = Raw(input_dir)
-    preprocess_land_cover(
-        src_files=raw.land_cover,
-        dst_raster=output_dir.joinpath("land_cover.tif").as_posix(),
-        **args,
-    )
-    preprocess_elevation(src_files=raw.elevation, dst_dir=output_dir, **args)
-    preprocess_osm(
-        src_file=raw.openstreetmap[0],
-        dst_dir=output_dir,
-        dst_crs=dst_crs,
-        dst_shape=shape,
-        dst_transform=transform,
-        geom=geom,
-        overwrite=overwrite,
-    )
-    preprocess_surface_water(
-        src_files=raw.surface_water,
-        dst_raster=output_dir.joinpath("surface_water.tif").as_posix(),
-        **args,
-    )
+
+    # The four preprocessing stages read from disjoint source directories and
+    # write disjoint outputs, so they can overlap: one stage warps while
+    # another reads tiles from disk. Futures are resolved explicitly so that
+    # any exception raised in a stage propagates to the caller.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(
+                preprocess_land_cover,
+                src_files=raw.land_cover,
+                dst_raster=output_dir.joinpath("land_cover.tif").as_posix(),
+                **args,
+            ),
+            executor.submit(
+                preprocess_elevation, src_files=raw.elevation, dst_dir=output_dir, **args
+            ),
+            executor.submit(
+                preprocess_osm,
+                src_file=raw.openstreetmap[0],
+                dst_dir=output_dir,
+                dst_crs=dst_crs,
+                dst_shape=shape,
+                dst_transform=transform,
+                geom=geom,
+                overwrite=overwrite,
+            ),
+            executor.submit(
+                preprocess_surface_water,
+                src_files=raw.surface_water,
+                dst_raster=output_dir.joinpath("surface_water.tif").as_posix(),
+                **args,
+            ),
+        ]
+        for future in futures:
+            future.result()
 
     log.info("Writing area of interest to disk.")
     with open(output_dir.joinpath("area_of_interest.geojson"), "w") as f:
         json.dump(geom.__geo_interface__, f)
 
 
+LC_CLASSES = [
+    "bare",
+    "crops",
+    "grass",
+    "moss",
+    "shrub",
+    "tree",
+    "urban",
+    "water-permanent",
+    "water-seasonal",
+]
+
+
+def bucket_land_cover_tiles(directory):
+    """Bucket extracted CGLC tiles per land cover class.
+
+    A single directory scan is performed instead of one glob per class.
+
+    Parameters
+    ----------
+    directory : str
+        Path to directory with extracted CGLC tiles.
+
+    Returns
+    -------
+    dict
+        Paths to the .tif tiles of each land cover class.
+    """
+    keys = {lc: f"{lc}-coverfraction-layer" for lc in LC_CLASSES}
+    buckets = {lc: [] for lc in LC_CLASSES}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".tif"):
+                continue
+            for lc_class, key in keys.items():
+                if key in entry.name:
+                    buckets[lc_class].append(entry.path)
+                    break
+    return buckets
+
+
+def land_cover_mosaic(lc_class, tiles, dst_dir):
+    """Mosaic the tiles of a single land cover class into a VRT.
+
+    Parameters
+    ----------
+    lc_class : str
+        Land cover class name.
+    tiles : list of str
+        Paths to the tiles of the class.
+    dst_dir : str
+        Directory where the mosaic VRT is written.
+
+    Returns
+    -------
+    str
+        Path to the class mosaic (or to the single input tile).
+    """
+    if len(tiles) > 1:
+        return build_vrt(
+            os.path.join(dst_dir, f"{lc_class}_mosaic.vrt"), tiles, src_nodata=255
+        )
+    return tiles[0]
+
+
 def preprocess_land_cover(
     src_files, dst_raster, dst_crs, dst_bounds, dst_res, geom=None, overwrite=False
 ):
@@ -240,66 +347,47 @@ def preprocess_land_cover(
         log.info("Land cover data already preprocessed. Skipping.")
         return
     log.info("Starting preprocessing of land cover data.")
-    LC_CLASSES = [
-        "bare",
-        "crops",
-        "grass",
-        "moss",
-        "shrub",
-        "tree",
-        "urban",
-        "water-permanent",
-        "water-seasonal",
-    ]
     with TemporaryDirectory(prefix="geohealthaccess_") as tmpdir:
 
         tmpdir = Path(tmpdir)
         for tile in src_files:
             unzip(tile, tmpdir)
 
-        reprojected_files = []
         tile_names = unique_tiles(tmpdir)
 
         if not tile_names:
             raise MissingDataError("Land cover data not found.")
 
-        for lc_class in LC_CLASSES:
-            tiles = [
-                p.as_posix()
-                for p in tmpdir.glob(f"*{lc_class}-coverfraction-layer*.tif")
-            ]
-            if len(tiles) > 1:
-                src_file = merge_tiles(
-                    tiles, os.path.join(tmpdir, f"{lc_class}_mosaic.tif"), nodata=255,
-                )
-            else:
-                src_file = tiles[0]
-            reprojected_files.append(
-                reproject(
-                    src_raster=src_file,
-                    dst_raster=os.path.join(tmpdir, f"{lc_class}.tif"),
-                    dst_crs=dst_crs,
-                    dst_bounds=dst_bounds,
-                    dst_res=dst_res,
-                    src_nodata=255,
-                    dst_nodata=255,
-                    dst_dtype="Byte",
-                    resampling_method="cubic",
-                    overwrite=overwrite,
-                )
-            )
-
-        if len(reprojected_files) > 1:
-            raster = concatenate_bands(
-                src_files=reprojected_files,
-                dst_file=dst_raster,
-                band_descriptions=LC_CLASSES,
-            )
-        else:
-            raster = reprojected_files[0]
+        # All land cover classes share the same grid, dtype and nodata value,
+        # so they can be stacked into a multi-band VRT and reprojected in a
+        # single warp pass instead of one gdalwarp call per class
+        buckets = bucket_land_cover_tiles(tmpdir)
+        mosaics = [
+            land_cover_mosaic(lc_class, buckets[lc_class], tmpdir)
+            for lc_class in LC_CLASSES
+        ]
+        stack = build_vrt(
+            os.path.join(tmpdir, "stack.vrt"), mosaics, separate=True
+        )
+        raster = reproject(
+            src_raster=stack,
+            dst_raster=dst_raster,
+            dst_crs=dst_crs,
+            dst_bounds=dst_bounds,
+            dst_res=dst_res,
+            src_nodata=255,
+            dst_nodata=255,
+            dst_dtype="Byte",
+            resampling_method="cubic",
+            overwrite=overwrite,
+        )
+        with rasterio.open(raster, "r+") as dst:
+            for i, lc_class in enumerate(LC_CLASSES, start=1):
+                dst.set_band_description(i, lc_class)
 
         if geom:
             mask_raster(raster, geom)
+        build_overviews(raster)
 
 
 def preprocess_osm(
@@ -380,10 +468,11 @@ def preprocess_surface_water(
     log.info("Starting preprocessing of surface water data.")
     with TemporaryDirectory(prefix="geohealthaccess_") as tmpdir:
         if len(src_files) > 1:
-            src_file = merge_tiles(
-                src_files, os.path.join(tmpdir, "mosaic.tif"), nodata=255
+            # mosaic tiles as a VRT so that gdalwarp reads the source tiles
+            # directly instead of a materialized intermediate raster
+            src_file = build_vrt(
+                os.path.join(tmpdir, "mosaic.vrt"), src_files, src_nodata=255
             )
-
         else:
             src_file = src_files[0]
         dst_raster = reproject(
@@ -400,6 +489,7 @@ def preprocess_surface_water(
         )
         if geom:
             mask_raster(dst_raster, geom)
+        build_overviews(dst_raster)
 
 
 def preprocess_elevation(
@@ -442,10 +532,13 @@ def preprocess_elevation(
         for tile in src_files:
             unzip(tile, tmpdir)
 
-        # merge tiles into a single mosaic if necessary
+        # mosaic tiles as a VRT if necessary; gdaldem and gdalwarp read the
+        # source tiles directly without an intermediate merged raster
         tiles = [f.as_posix() for f in tmpdir.glob("*.hgt")]
         if len(tiles) > 1:
-            dem = merge_tiles(tiles, os.path.join(tmpdir, "mosaic.tif"), nodata=-32768)
+            dem = build_vrt(
+                os.path.join(tmpdir, "mosaic.vrt"), tiles, src_nodata=-32768
+            )
         else:
             dem = tiles[0]
 
@@ -465,13 +558,13 @@ def preprocess_elevation(
             log.info("Aspect raster already exists. Skipping processing.")
             aspect = dst_aspect
 
-        for src, dst in zip((dem, slope, aspect), (dst_dem, dst_slope, dst_aspect)):
-
+        def finalize(src, dst):
+            """Reproject, mask and build overviews for a topography raster."""
             if os.path.isfile(dst) and not overwrite:
                 log.info(
                     f"{os.path.basename(dst)} already exists. Skipping processing."
                 )
-                continue
+                return
 
             # dtype is Int16 for elevation, and Float32 for slope & aspect
             nodata = -9999
@@ -494,6 +587,17 @@ def preprocess_elevation(
             )
             if geom:
                 mask_raster(dst, geom)
+            build_overviews(dst)
+
+        # Elevation, slope and aspect rasters are independent of each other
+        # and the heavy lifting happens in gdalwarp subprocesses or GIL-free
+        # GDAL code, so they can be finalized concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(
+                executor.map(
+                    finalize, (dem, slope, aspect), (dst_dem, dst_slope, dst_aspect)
+                )
+            )
 
 
 @cli.command()
@@ -169,7 +169,15 @@ class GSW:
         self._checkproduct(product)
         return f"{self.BASEURL}/{product}/{product}_{tile}_v{self.VERSION}.tif"
 
-    def download(self, tile, product, output_dir, show_progress=True, overwrite=False):
+    def download(
+        self,
+        tile,
+        product,
+        output_dir,
+        show_progress=True,
+        overwrite=False,
+        pbar_position=0,
+    ):
         """Download a GSW tile.
 
         Parameters
@@ -184,6 +192,9 @@ class GSW:
             Show download progress bar.
         overwrite : bool, optional
             Force overwrite of existing files.
+        pbar_position : int, optional
+            Absolute position of the progress bar in case several
+            downloads run concurrently.
 
         Returns
         -------
@@ -192,7 +203,7 @@ class GSW:
         """
         url = self.url(tile, product)
         return download_from_url(
-            self.session, url, output_dir, show_progress, overwrite
+            self.session, url, output_dir, show_progress, overwrite, pbar_position
         )
 
     def download_size(self, tile, product):
@@ -2,6 +2,9 @@
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from tempfile import TemporaryDirectory
 import shutil
 import logging
@@ -12,15 +15,93 @@ import numpy as np
 import rasterio
 from rasterio.crs import CRS
 from pkg_resources import resource_filename
+from rasterio.errors import RasterioIOError
 from rasterio.features import rasterize
+from shapely.geometry import mapping
 
 from geohealthaccess import grasshelper
-from geohealthaccess.preprocessing import default_compression, GDAL_CO
+from geohealthaccess.preprocessing import (
+    aggregated_windows,
+    default_compression,
+    GDAL_CO,
+)
 from geohealthaccess.grasshelper import gscript
 
+try:
+    from numba import guvectorize, njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
 log = logging.getLogger(__name__)
 
 
+def _friction_kernel(speed, out, distance, max_time):
+    """Compute time to cross each pixel in a single fused loop.
+
+    Parameters
+    ----------
+    speed : ndarray
+        Flattened speed values in km/h.
+    out : ndarray
+        Flattened preallocated output buffer (time in seconds).
+    distance : float
+        Distance to cross (pixel size in meters, or 1).
+    max_time : float
+        Max. friction value (seconds).
+    """
+    for i in prange(speed.size):
+        v = speed[i] / 3.6  # From km/hour to m/second
+        if v > 0:
+            t = distance / v
+        else:
+            t = -9999.0
+        if np.isnan(t) or np.isinf(t) or t >= max_time:
+            t = -9999.0
+        out[i] = t
+
+
+def _landcover_speed_kernel(weights, coverfractions, nodata, out):
+    """Weighted sum of land cover fractions in a single fused pass.
+
+    Parameters
+    ----------
+    weights : ndarray
+        Speed weight of each land cover band (km/h divided by 100).
+    coverfractions : ndarray
+        Land cover percentages (one band per class).
+    nodata : float
+        Source nodata value (pixels with nodata in any band are
+        assigned a speed of 0).
+    out : ndarray
+        Output speed values in km/h.
+    """
+    n, height, width = coverfractions.shape
+    for i in range(height):
+        for j in range(width):
+            speed = np.float32(0)
+            valid = True
+            for k in range(n):
+                cover = coverfractions[k, i, j]
+                if cover == nodata:
+                    valid = False
+                speed += weights[k] * cover
+            if not valid:
+                speed = np.float32(0)
+            out[i, j] = speed
+
+
+if HAS_NUMBA:
+    _friction_kernel = njit(parallel=True, fastmath=True, cache=True)(_friction_kernel)
+    _landcover_speed_kernel = guvectorize(
+        ["void(float32[:], uint8[:,:,:], float32, float32[:,:])"],
+        "(n),(n,h,w),()->(h,w)",
+        nopython=True,
+    )(_landcover_speed_kernel)
+
+
 def default_landcover_speeds():
     """Get default speeds associated with land cover catagories.
 
@@ -92,6 +173,71 @@ def get_segment_speed(
     return base_speed * min(tracktype, smoothness, surface)
 
 
+def _map_speeds(tags, speeds, default):
+    """Map an OSM tag column to speed values through a lookup table.
+
+    The column is converted to a pandas Categorical so that the dict
+    lookup is performed once per unique tag value instead of once per
+    row; rows are then resolved with a single array indexing operation.
+
+    Parameters
+    ----------
+    tags : Series
+        OSM tag values (one per road segment).
+    speeds : dict
+        Speed or speed factor associated to each tag value.
+    default : float
+        Value assigned to missing or unknown tags.
+
+    Returns
+    -------
+    ndarray
+        Mapped speed values as a float32 array.
+    """
+    tags = tags.astype("category")
+    lut = np.array(
+        [speeds.get(tag, default) for tag in tags.cat.categories], dtype=np.float32
+    )
+    if not lut.size:
+        return np.full(len(tags), default, dtype=np.float32)
+    codes = tags.cat.codes.to_numpy()
+    # NA values are encoded as -1 and are assigned the default value
+    return np.where(codes < 0, np.float32(default), lut[codes])
+
+
+def _skip_existing(dst_file, overwrite):
+    """Check if an existing output raster can be reused.
+
+    A leftover file from a run that crashed mid-write would otherwise be
+    silently reused, so the existing raster is validated by opening it
+    before short-circuiting.
+
+    Parameters
+    ----------
+    dst_file : str
+        Path to output raster.
+    overwrite : bool
+        Overwrite existing files.
+
+    Returns
+    -------
+    bool
+        `True` if the existing raster is valid and can be reused.
+    """
+    if not os.path.isfile(dst_file) or overwrite:
+        return False
+    try:
+        with rasterio.open(dst_file):
+            pass
+        log.info(f"{os.path.basename(dst_file)} already exists. Skipping.")
+        return True
+    except RasterioIOError:
+        log.warning(
+            f"{os.path.basename(dst_file)} exists but cannot be read. Recomputing."
+        )
+        return False
+
+
 def speed_from_roads(
     src_roads,
     dst_file,
@@ -134,12 +280,11 @@ def speed_from_roads(
         Path to output raster.
     """
     log.info("Creating travel speeds raster from the road network.")
-    if os.path.isfile(dst_file) and not overwrite:
-        log.info(f"{os.path.basename(dst_file)} already exists. Skipping.")
+    if _skip_existing(dst_file, overwrite):
         return dst_file
     if not speeds:
-        log.info("No land cover speeds provided. Using default values.")
-        speeds = default_landcover_speeds()
+        log.info("No transport network speeds provided. Using default values.")
+        speeds = default_transport_speeds()
 
     # Raster profile
     dst_profile = rasterio.default_gtiff_profile
@@ -160,20 +305,33 @@ def speed_from_roads(
         network = pd.concat((network, ferry))
     network = network.to_crs(dst_crs)
 
-    # Get shapes and speed values of road segments
-    shapes = []
-    for _, row in network.iterrows():
-        speed = get_segment_speed(
-            row.highway, row.tracktype, row.smoothness, row.surface, speeds
-        )
-        if speed:
-            shapes.append((row.geometry.__geo_interface__, speed))
+    # Get shapes and speed values of road segments. OSM tags are mapped to
+    # speed values through per-category lookup tables instead of row by row,
+    # as pure Python overhead dominates for large road networks.
+    base_speed = _map_speeds(network.highway, speeds["highway"], np.nan)
+    tracktype = _map_speeds(network.tracktype, speeds["tracktype"], 1)
+    smoothness = _map_speeds(network.smoothness, speeds["smoothness"], 1)
+    surface = _map_speeds(network.surface, speeds["surface"], 1)
+    speed = base_speed * np.minimum.reduce([tracktype, smoothness, surface])
+
+    # Ignore unsupported road segments, i.e. those with an highway tag that
+    # is not assigned any base speed
+    supported = ~np.isnan(base_speed)
+
+    # Shapes are generated lazily so that the geometry mappings of large
+    # networks are never all held in memory at once
+    n_shapes = int(np.count_nonzero(supported))
+    shapes = (
+        (mapping(geom), value)
+        for geom, value in zip(network.geometry.values[supported], speed[supported])
+    )
 
     # Add ferry routes if needed
     if src_ferry:
         ferry = gpd.read_file(src_ferry)
-        speed = speeds["route"]["ferry"]
-        shapes += [(geom.__geo_interface__, speed) for geom in ferry.geometry]
+        ferry_speed = speeds["route"]["ferry"]
+        shapes = chain(shapes, ((mapping(geom), ferry_speed) for geom in ferry.geometry))
+        n_shapes += len(ferry)
 
     speed_raster = rasterize(
         shapes=shapes,
@@ -183,10 +341,14 @@ def speed_from_roads(
         all_touched=True,
         dtype="float32",
     )
-    log.info(f"{len(shapes)} transport network segments rasterized.")
+    log.info(f"{n_shapes} transport network segments rasterized.")
 
-    with rasterio.open(dst_file, "w", **dst_profile) as dst:
+    # Write to a temporary file and rename it once complete, so that an
+    # interrupted run never leaves a partial raster behind
+    tmp_file = dst_file + ".part"
+    with rasterio.open(tmp_file, "w", **dst_profile) as dst:
         dst.write(speed_raster, 1)
+    os.replace(tmp_file, dst_file)
 
     log.info(
         f"Transport network travel speeds saved as `{os.path.basename(dst_file)}`."
@@ -220,8 +382,7 @@ def speed_from_landcover(src_landcover, dst_file, speeds=None, overwrite=False):
         Path to output raster.
     """
     log.info("Creating travel speeds raster from land cover.")
-    if os.path.isfile(dst_file) and not overwrite:
-        log.info(f"{os.path.basename(dst_file)} already exists. Skipping.")
+    if _skip_existing(dst_file, overwrite):
         return dst_file
     if not speeds:
         log.info("No land cover speeds provided. Using default values.")
@@ -232,17 +393,54 @@ def speed_from_landcover(src_landcover, dst_file, speeds=None, overwrite=False):
             count=1, dtype="float32", nodata=-9999, **default_compression("float32")
         )
 
+    # Write to a temporary file and rename it once complete, so that an
+    # interrupted run never leaves a partial raster behind
+    tmp_file = dst_file + ".part"
     with rasterio.open(src_landcover) as src, rasterio.open(
-        dst_file, "w", **dst_profile
+        tmp_file, "w", **dst_profile
     ) as dst:
-        for _, window in dst.block_windows(1):
-            speed = np.zeros(shape=(window.height, window.width), dtype=np.float32)
-            for id, landcover in enumerate(src.descriptions, start=1):
-                coverfraction = src.read(window=window, indexes=id)
-                speed += (coverfraction / 100.0) * speeds[landcover]
-                speed[coverfraction == src.nodata] = 0
+        # The weighted sum over land cover bands is computed as a single
+        # matrix-vector product instead of one accumulation pass per class
+        weights = np.array(
+            [speeds[landcover] / 100.0 for landcover in src.descriptions],
+            dtype=np.float32,
+        )
+        nodata = src.nodata
+
+        # GDAL datasets are not thread-safe: reads and writes must be
+        # guarded with locks, but the computation can run concurrently
+        read_lock = threading.Lock()
+        write_lock = threading.Lock()
+
+        # Nodata comparisons in the numba kernel need a float scalar; NaN
+        # never compares equal so it disables the check when nodata is unset
+        kernel_nodata = np.float32(nodata if nodata is not None else np.nan)
+
+        def process(window):
+            """Compute travel speeds for a single window."""
+            with read_lock:
+                coverfractions = src.read(window=window)
+            if HAS_NUMBA:
+                # Fused single-pass kernel (avoids the temporary arrays
+                # allocated by the matrix product and the nodata mask)
+                speed = _landcover_speed_kernel(
+                    weights, coverfractions, kernel_nodata
+                )
+            else:
+                height, width = coverfractions.shape[1:]
+                speed = weights @ coverfractions.reshape(
+                    len(weights), height * width
+                ).astype(np.float32)
+                speed = speed.reshape(height, width)
+                speed[(coverfractions == nodata).any(axis=0)] = 0
             speed[speed < 0] = -9999
-            dst.write(speed, window=window, indexes=1)
+            with write_lock:
+                dst.write(speed, window=window, indexes=1)
+
+        windows = list(aggregated_windows(dst))
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(process, windows))
+    os.replace(tmp_file, dst_file)
 
     log.info(f"Land cover travel speeds saved as `{os.path.basename(dst_file)}`.")
 
@@ -288,22 +486,34 @@ def travel_obstacles(src_water, src_slope, dst_file, max_slope=30, overwrite=Fal
     # Get raster profile information
     with rasterio.open(src_water[0]) as src:
         dst_profile = src.profile
-        nrows, ncols = src.height, src.width
         dst_profile.update(dtype="uint8", nodata=255, **default_compression("uint8"))
 
-    obstacle = np.zeros(shape=(nrows, ncols), dtype=np.uint8)
     for water in src_water:
         log.info(f"Setting water pixels from {os.path.basename(water)} as obstacles.")
-        with rasterio.open(water) as src:
-            obstacle[src.read(1) > 0] = 1
-    with rasterio.open(src_slope) as src:
-        log.info(f"Setting slope pixels > {max_slope}° as obstacles.")
-        obstacle[src.read(1) >= max_slope] = 1
-    with rasterio.open(dst_file, "w", **dst_profile) as dst:
-        dst.write(obstacle, 1)
-    log.info(
-        f"Computed obstacle raster ({np.count_nonzero(obstacle)} obstacle pixels)."
-    )
+    log.info(f"Setting slope pixels > {max_slope}° as obstacles.")
+
+    # Obstacles are computed per window so that memory usage stays
+    # constant regardless of the size of the area of interest
+    n_obstacles = 0
+    sources = [rasterio.open(water) for water in src_water]
+    try:
+        with rasterio.open(src_slope) as src_sl, rasterio.open(
+            dst_file, "w", **dst_profile
+        ) as dst:
+            for window in aggregated_windows(dst):
+                obstacle = np.zeros(
+                    shape=(window.height, window.width), dtype=np.uint8
+                )
+                for src in sources:
+                    obstacle[src.read(1, window=window) > 0] = 1
+                obstacle[src_sl.read(1, window=window) >= max_slope] = 1
+                n_obstacles += np.count_nonzero(obstacle)
+                dst.write(obstacle, 1, window=window)
+    finally:
+        for src in sources:
+            src.close()
+
+    log.info(f"Computed obstacle raster ({n_obstacles} obstacle pixels).")
     return dst_file
 
 
@@ -342,37 +552,44 @@ def combine_speed(
         Path to output speed raster.
     """
     log.info(f"Combining travel speeds rasters for `{mode}` transport mode.")
-    with rasterio.open(landcover) as src:
-        dst_profile = src.profile
-    dst_profile.update(dtype="float32", nodata=-9999, **default_compression("float32"))
 
     # Check mode parameter
     if mode not in ("car", "bike", "walk"):
         raise ValueError("Unrecognized transport mode.")
 
+    # Source rasters are opened once for the whole function: the landcover
+    # dataset provides the output profile and is then read per window
     with rasterio.open(landcover) as srcland, rasterio.open(
         transport
-    ) as srcnet, rasterio.open(obstacle) as srcobs, rasterio.open(
-        dst_file, "w", **dst_profile
-    ) as dst:
-        for _, window in dst.block_windows(1):
-            speed_landcover = srcland.read(window=window, indexes=1)
-            speed_roads = srcnet.read(window=window, indexes=1)
-            obstacle = srcobs.read(window=window, indexes=1)
-            speed_landcover[obstacle == 1] = 0
-            speed = np.maximum(speed_landcover, speed_roads)
-
-            on_road = speed_roads > 0
-            if mode == "bike":
-                speed[on_road] = bike_basespeed
-            if mode == "walk":
-                speed[on_road] = walk_basespeed
-
-            # Update nodata values and write block to disk
-            speed[np.isnan(speed_landcover)] = -9999
-            speed[np.isnan(speed_roads)] = -9999
-            speed[speed < 0] = -9999
-            dst.write(speed.astype(np.float32), window=window, indexes=1)
+    ) as srcnet, rasterio.open(obstacle) as srcobs:
+        dst_profile = srcland.profile
+        dst_profile.update(
+            dtype="float32", nodata=-9999, **default_compression("float32")
+        )
+        nodata = dst_profile.get("nodata")
+        with rasterio.open(dst_file, "w", **dst_profile) as dst:
+            for window in aggregated_windows(dst):
+                speed_landcover = srcland.read(window=window, indexes=1)
+                speed_roads = srcnet.read(window=window, indexes=1)
+                obstacle_w = srcobs.read(window=window, indexes=1)
+                speed_landcover[obstacle_w == 1] = 0
+                # NaN values must be flagged before the in-place maximum
+                # overwrites the land cover speeds
+                invalid = np.isnan(speed_landcover) | np.isnan(speed_roads)
+                speed = np.maximum(speed_landcover, speed_roads, out=speed_landcover)
+
+                on_road = speed_roads > 0
+                if mode == "bike":
+                    speed[on_road] = bike_basespeed
+                if mode == "walk":
+                    speed[on_road] = walk_basespeed
+
+                # Update nodata values and write block to disk
+                speed[invalid] = nodata
+                speed[speed < 0] = nodata
+                dst.write(
+                    speed.astype(np.float32, copy=False), window=window, indexes=1
+                )
 
     return dst_file
 
@@ -400,29 +617,51 @@ def compute_friction(speed_raster, dst_file, max_time=3600, one_meter=False):
     with rasterio.open(speed_raster) as src:
         dst_profile = src.profile
         xres = abs(src.transform.a)
+        # Float32 has ample precision for times in seconds and halves the
+        # memory traffic of the window loop compared to float64
         dst_profile.update(
-            dtype="float64", nodata=-9999, **default_compression("float64")
+            dtype="float32", nodata=-9999, **default_compression("float32")
         )
+    # Distance to cross is loop-invariant: one meter or one pixel
+    distance = 1 if one_meter else xres
+
     with rasterio.open(speed_raster) as src, rasterio.open(
         dst_file, "w", **dst_profile
     ) as dst:
-        for _, window in dst.block_windows(1):
-            speed = src.read(window=window, indexes=1).astype(np.float64)
-            speed /= 3.6  # From km/hour to m/second
-            nonzero = speed != 0
-            time_to_cross = np.zeros_like(speed, dtype="float64")
-            if one_meter:
-                # Time to cross one meter
-                time_to_cross[nonzero] = 1 / speed[nonzero]
+        # GDAL datasets are not thread-safe: reads and writes must be
+        # guarded with locks, but the computation can run concurrently
+        read_lock = threading.Lock()
+        write_lock = threading.Lock()
+
+        def process(window):
+            """Compute friction for a single window."""
+            with read_lock:
+                speed = src.read(window=window, indexes=1).astype(
+                    np.float32, copy=False
+                )
+            time_to_cross = np.empty_like(speed)
+            if HAS_NUMBA:
+                # Fused single-pass kernel (avoids the temporary arrays
+                # allocated by the chained NumPy operations below)
+                _friction_kernel(speed.ravel(), time_to_cross.ravel(), distance, max_time)
             else:
-                # Time to cross one pixel
-                time_to_cross[nonzero] = xres / speed[nonzero]
-            # Clean bad values
-            time_to_cross[speed == 0] = -9999
-            time_to_cross[np.isnan(time_to_cross)] = -9999
-            time_to_cross[np.isinf(time_to_cross)] = -9999
-            time_to_cross[time_to_cross >= max_time] = -9999
-            dst.write(time_to_cross, window=window, indexes=1)
+                np.divide(speed, 3.6, out=speed)  # From km/hour to m/second
+                # Null and negative speeds (nodata) are not crossable,
+                # matching the numba kernel above
+                positive = speed > 0
+                time_to_cross.fill(-9999)
+                np.divide(distance, speed, out=time_to_cross, where=positive)
+                # Clean bad values
+                time_to_cross[np.isnan(time_to_cross)] = -9999
+                time_to_cross[np.isinf(time_to_cross)] = -9999
+                time_to_cross[time_to_cross >= max_time] = -9999
+            with write_lock:
+                dst.write(time_to_cross, window=window, indexes=1)
+
+        windows = list(aggregated_windows(dst))
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(process, windows))
+
     return dst_file
 
 
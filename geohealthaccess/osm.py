@@ -5,7 +5,8 @@ The module provides functions to work with .osm.pbf files.
 """
 
 import os
-from subprocess import run, PIPE, DEVNULL
+import shutil
+from subprocess import run, CalledProcessError, Popen, PIPE, DEVNULL
 import logging
 import tempfile
 import functools
@@ -22,14 +23,18 @@ from geohealthaccess.utils import human_readable_size
 log = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _osmium_available():
+    """Check once if the osmium executable is available."""
+    return shutil.which("osmium") is not None
+
+
 def requires_osmium(func):
     """Check that osmium is available on the system."""
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            run(["osmium"], stdout=DEVNULL, stderr=DEVNULL)
-        except FileNotFoundError:
+        if not _osmium_available():
             raise OsmiumNotFoundError("Osmium not found.")
         return func(*args, **kwargs)
 
@@ -77,7 +82,7 @@ def tags_filter(osm_pbf, dst_fname, expression, overwrite=True):
 
 
 @requires_osmium
-def to_geojson(osm_pbf, dst_fname, overwrite=True):
+def to_geojson(osm_pbf, dst_fname, fmt=None, overwrite=True):
     """Convert an input .osm.pbf file to a GeoJSON file.
 
     Parameters
@@ -86,6 +91,9 @@ def to_geojson(osm_pbf, dst_fname, overwrite=True):
         Path to input .osm.pbf file.
     dst_fname : str
         Path to output .osm.pbf file.
+    fmt : str, optional
+        Osmium output format (e.g. `geojson` or `geojsonseq`). By default,
+        the format is guessed by osmium from the output file extension.
     overwrite : bool, optional
         Overwrite existing file.
 
@@ -95,6 +103,8 @@ def to_geojson(osm_pbf, dst_fname, overwrite=True):
         Path to output GeoJSON file.
     """
     command = ["osmium", "export", osm_pbf, "-o", dst_fname]
+    if fmt:
+        command += ["-f", fmt]
     if overwrite:
         command += ["--overwrite"]
     log.info(f"Running command: {' '.join(command)}")
@@ -108,6 +118,53 @@ def to_geojson(osm_pbf, dst_fname, overwrite=True):
     return dst_fname
 
 
+@requires_osmium
+def filtered_export(osm_pbf, dst_fname, expression, fmt="geojsonseq"):
+    """Filter an .osm.pbf file and export matching objects in one pass.
+
+    The output of `osmium tags-filter` is piped directly into
+    `osmium export`, so the filtered .osm.pbf is never written to disk
+    and both processes run concurrently.
+
+    Parameters
+    ----------
+    osm_pbf : str
+        Path to input .osm.pbf file.
+    dst_fname : str
+        Path to output file.
+    expression : str
+        Osmium tags-filter expression. See `osmium tags-filter` manpage for details.
+    fmt : str, optional
+        Osmium export output format (default=`geojsonseq`).
+
+    Returns
+    -------
+    dst_fname : str
+        Path to output file.
+    """
+    filter_cmd = ["osmium", "tags-filter", "-f", "pbf", osm_pbf]
+    filter_cmd += expression.split(" ")
+    filter_cmd += ["-o", "-"]
+    export_cmd = ["osmium", "export", "-i", "pbf", "-", "-f", fmt]
+    export_cmd += ["-o", dst_fname, "--overwrite"]
+    log.info(f"Running command: {' '.join(filter_cmd)} | {' '.join(export_cmd)}")
+    filter_proc = Popen(filter_cmd, stdout=PIPE, stderr=DEVNULL)
+    export_proc = Popen(export_cmd, stdin=filter_proc.stdout, stderr=DEVNULL)
+    filter_proc.stdout.close()
+    export_proc.wait()
+    filter_proc.wait()
+    for proc, command in ((filter_proc, filter_cmd), (export_proc, export_cmd)):
+        if proc.returncode != 0:
+            raise CalledProcessError(proc.returncode, command)
+    src_size = human_readable_size(os.path.getsize(osm_pbf))
+    dst_size = human_readable_size(os.path.getsize(dst_fname))
+    log.info(
+        f"Created {os.path.basename(dst_fname)} ({dst_size}) "
+        f"from {os.path.basename(osm_pbf)} ({src_size})."
+    )
+    return dst_fname
+
+
 # Osmium tags-filter expression and properties of interest for each supported
 # thematic extract.
 EXTRACTS = {
@@ -142,20 +199,12 @@ EXTRACTS = {
 }
 
 
-def _centroid(geom):
-    """Get centroid if possible."""
-    if geom.geom_type in ("Polygon", "MultiPolygon"):
-        return geom.centroid
-    return geom
-
-
 def _filter_columns(geodataframe, valid_columns):
     """Filter columns of a given geodataframe."""
-    n_removed = 0
-    for column in geodataframe.columns:
-        if column not in valid_columns and column != "geometry":
-            geodataframe = geodataframe.drop([column], axis=1)
-            n_removed += 1
+    valid = set(valid_columns) | {"geometry"}
+    keep = [column for column in geodataframe.columns if column in valid]
+    n_removed = len(geodataframe.columns) - len(keep)
+    geodataframe = geodataframe[keep]
     log.info(f"Removed {n_removed} columns. {len(geodataframe.columns)} remaining.")
     return geodataframe
 
@@ -214,34 +263,33 @@ def thematic_extract(osm_pbf, theme, dst_fname):
 
     with tempfile.TemporaryDirectory(prefix="geohealthaccess_") as tmpdir:
 
-        # Filter input .osm.pbf file and export to GeoJSON with osmium-tools
-        filtered = tags_filter(
-            osm_pbf, os.path.join(tmpdir, "filtered.osm.pbf"), expression
+        # Filter the input .osm.pbf file and export matching objects to an
+        # intermediary GeoJSONSeq file in a single osmium pipeline, avoiding
+        # a disk round-trip of the filtered .osm.pbf file
+        intermediary = filtered_export(
+            osm_pbf, os.path.join(tmpdir, "intermediary.geojsonl"), expression
         )
 
-        # Abort if .osm.pbf is empty
-        if _is_empty(filtered):
+        # Abort if no feature matched the filter expression
+        if not os.path.getsize(intermediary):
             raise MissingDataError(
                 f"No {theme} features in {os.path.basename(osm_pbf)}."
             )
 
-        # An intermediary GeoJSON file so that data can be loaded with GeoPandas
-        intermediary = to_geojson(
-            filtered, os.path.join(tmpdir, "intermediary.geojson")
-        )
-
         # Drop useless columns
         geodf = gpd.read_file(intermediary)
         log.info(f"Loaded OSM data into a GeoDataFrame with {len(geodf)} records.")
         geodf = _filter_columns(geodf, properties)
 
-        # Convert Polygon or MultiPolygon features to Point
+        # Convert Polygon or MultiPolygon features to Point. GeoSeries.centroid
+        # runs in a single GEOS loop instead of one Python call per feature.
         if theme == "health":
-            geodf["geometry"] = geodf.geometry.apply(_centroid)
+            polygons = geodf.geom_type.isin(("Polygon", "MultiPolygon"))
+            geodf.loc[polygons, "geometry"] = geodf.loc[polygons, "geometry"].centroid
             log.info("Converted Polygon and MultiPolygon to Point features.")
 
         # Drop geometries of incorrect types
-        geodf = geodf[np.isin(geodf.geom_type, geom_types)]
+        geodf = geodf[np.isin(geodf.geom_type.values, geom_types)]
         log.info(f"Removed objects with invalid geom types ({len(geodf)} remaining).")
 
         # Reset index, set CRS and save to output file
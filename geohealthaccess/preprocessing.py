@@ -9,9 +9,11 @@ from tempfile import TemporaryDirectory
 import numpy as np
 import rasterio
 from rasterio.crs import CRS
+from rasterio.enums import Resampling
 from rasterio.features import rasterize
 from rasterio.transform import from_origin
 from rasterio.warp import aligned_target, transform_bounds, transform_geom
+from rasterio.windows import Window
 
 log = logging.getLogger(__name__)
 
@@ -20,12 +22,14 @@ log = logging.getLogger(__name__)
 # NB: PREDICTOR=3 is better for floating point data
 GDAL_CO = [
     "TILED=YES",
-    "BLOCKXSIZE=256",
-    "BLOCKYSIZE=256",
-    "COMPRESS=DEFLATE",
+    "BLOCKXSIZE=512",
+    "BLOCKYSIZE=512",
+    "INTERLEAVE=BAND",
+    "COMPRESS=ZSTD",
+    "ZSTD_LEVEL=1",
     "NUM_THREADS=ALL_CPUS",
     "PREDICTOR=2",
-    "ZLEVEL=6",
+    "BIGTIFF=IF_SAFER",
 ]
 
 # GDAL data types supported for the GeoTIFF driver
@@ -47,8 +51,9 @@ GDAL_DTYPES = [
 def default_compression(dtype):
     """Get default GeoTIFF compression options according to data type.
 
-    Uses `DEFLATE` as the default compression algorithm, with `ZLEVEL=6` and
-    `PREDICTOR=2`. Set `PREDICTOR=3` for floating point data. Set
+    Uses `ZSTD` as the default compression algorithm, with `ZSTD_LEVEL=1` and
+    `PREDICTOR=2` (faster to decode and usually smaller than `LZW` or
+    `DEFLATE`). Set `PREDICTOR=3` for floating point data. Set
     `NUM_THREADS=ALL_CPUS` to provide multi-threaded compression.
 
     Parameters
@@ -62,10 +67,11 @@ def default_compression(dtype):
         GeoTIFF driver compression options.
     """
     options = {
-        "compress": "deflate",
+        "compress": "zstd",
         "predictor": 2,
-        "zlevel": 6,
+        "zstd_level": 1,
         "num_threads": "all_cpus",
+        "bigtiff": "if_safer",
     }
     if isinstance(dtype, str):
         dtype = np.dtype(dtype)
@@ -82,7 +88,66 @@ def default_tiling():
     dict
         GeoTIFF driver tiling options.
     """
-    return {"tiled": True, "blockxsize": 256, "blockysize": 256}
+    return {"tiled": True, "blockxsize": 512, "blockysize": 512}
+
+
+def build_overviews(src_file, factors=(2, 4, 8, 16), resampling="average"):
+    """Build internal overviews for a raster.
+
+    Overviews make downsampled and zoomed-out reads hit precomputed
+    low-resolution blocks instead of the full-resolution data, following the
+    cloud-optimized GeoTIFF layout.
+
+    Parameters
+    ----------
+    src_file : str
+        Path to input raster (updated in-place).
+    factors : tuple of int, optional
+        Overview decimation factors (default=(2, 4, 8, 16)).
+    resampling : str, optional
+        Resampling method used to compute the overviews (default=`average`).
+
+    Returns
+    -------
+    src_file : str
+        Path to input raster.
+    """
+    log.info(f"Building overviews for {os.path.basename(src_file)}.")
+    with rasterio.Env(GDAL_TIFF_OVR_BLOCKSIZE=128):
+        with rasterio.open(src_file, "r+") as dst:
+            dst.build_overviews(factors, Resampling[resampling])
+    return src_file
+
+
+def aggregated_windows(src, factor=8):
+    """Iterate over super-blocks of a tiled raster.
+
+    Groups `factor` x `factor` adjacent on-disk blocks into a single
+    window aligned to the block grid, so that windowed loops issue fewer
+    RasterIO calls without losing bounded memory usage.
+
+    Parameters
+    ----------
+    src : rasterio dataset
+        Input raster dataset (tiled).
+    factor : int, optional
+        Nb. of on-disk blocks aggregated in each dimension (default=8).
+
+    Yields
+    ------
+    Window
+        Aggregated raster window.
+    """
+    blockysize, blockxsize = src.block_shapes[0]
+    height, width = blockysize * factor, blockxsize * factor
+    for row_off in range(0, src.height, height):
+        for col_off in range(0, src.width, width):
+            yield Window(
+                col_off=col_off,
+                row_off=row_off,
+                width=min(width, src.width - col_off),
+                height=min(height, src.height - row_off),
+            )
 
 
 def create_grid(geom, dst_crs, dst_res):
@@ -160,6 +225,44 @@ def merge_tiles(src_files, dst_file, nodata=-1):
     return dst_file
 
 
+def build_vrt(dst_file, src_files, separate=False, src_nodata=None):
+    """Build a GDAL virtual raster from a list of input rasters.
+
+    A VRT is an XML description of the mosaic (or band stack) that does not
+    copy any pixel data, so it can be used as a lightweight input for further
+    processing steps such as :func:`reproject`.
+
+    Note
+    ----
+    See `gdalbuildvrt documentation <https://gdal.org/programs/gdalbuildvrt.html>`_.
+
+    Parameters
+    ----------
+    dst_file : str
+        Path to output .vrt file.
+    src_files : list of str
+        Paths to input rasters.
+    separate : bool, optional
+        Place each input file into a separate band instead of mosaicking.
+    src_nodata : int or float, optional
+        Nodata value of the input rasters.
+
+    Returns
+    -------
+    dst_file : str
+        Path to output .vrt file.
+    """
+    command = ["gdalbuildvrt", "-oo", "NUM_THREADS=ALL_CPUS"]
+    if separate:
+        command += ["-separate"]
+    if src_nodata is not None:
+        command += ["-srcnodata", str(src_nodata)]
+    command += [dst_file] + list(src_files)
+    log.info(f"Running command `{' '.join(command)}`.")
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return dst_file
+
+
 def reproject(
     src_raster,
     dst_raster,
@@ -170,6 +273,9 @@ def reproject(
     dst_nodata=None,
     dst_dtype=None,
     resampling_method="near",
+    num_threads="ALL_CPUS",
+    warp_mem_limit=512,
+    error_threshold=0.125,
     overwrite=False,
 ):
     """Reproject a raster to a different CRS.
@@ -195,6 +301,13 @@ def reproject(
     resampling_method : str, optional
         Resampling method: `near`, `bilinear`, `cubic`, `cubicspline`, `lanczos`,
         `average`, `mode`, `max`, `min`, `med`, `q1`, `q3` or `sum`.
+    num_threads : int or str, optional
+        Nb. of warper threads (default=`ALL_CPUS`).
+    warp_mem_limit : int, optional
+        Size of the warp working buffer in MB (default=512).
+    error_threshold : float, optional
+        Error threshold (in pixels) of the approximate transformer
+        (default=0.125). Set to 0 to force exact per-pixel reprojection.
     overwrite : bool, optional
         Overwrite existing files.
 
@@ -213,6 +326,13 @@ def reproject(
     ]
     command += ["-tr", str(dst_res), str(dst_res)]  # spatial resolution
     command += ["-tap", "-te"] + [str(xy) for xy in dst_bounds]  # align to extent
+    # Multi-threaded warping with a larger working buffer (default is
+    # single-threaded with a 64 MB buffer)
+    command += ["-multi", "-wo", f"NUM_THREADS={num_threads}"]
+    command += ["-wm", str(warp_mem_limit)]
+    # Approximate transformer: exact PROJ math is only evaluated on a
+    # subgrid and linearly interpolated within the error threshold
+    command += ["-et", str(error_threshold)]
     if overwrite:
         command += ["-overwrite"]
     command += [src_raster, dst_raster]  # input/output files
@@ -1,5 +1,6 @@
 """Utility functions."""
 
+import functools
 import json
 import logging
 import os
@@ -35,11 +36,11 @@ def size_from_url(session, url):
     Returns
     -------
     size : int
-        Size in bytes.
+        Size in bytes (None if the server does not advertise it).
     """
     r = session.head(url, allow_redirects=True, headers={"Accept-Encoding": "identity"})
     content_length = r.headers.get("Content-Length")
-    return int(content_length)
+    return int(content_length) if content_length else None
 
 
 def http_same_size(session, url, fname):
@@ -61,20 +62,91 @@ def http_same_size(session, url, fname):
     return remote_size == local_size
 
 
-def country_geometry(country):
-    """Get the shapely geometry corresponding to a given country
-    identified by its name or its three-letters ISO A3 Code.
+@functools.lru_cache(maxsize=1)
+def _country_index():
+    """Index raw country geometries by lowercase name and ISO A3 code.
+
+    The world countries GeoJSON is parsed once on first use; lookups are
+    then a single dict access.
     """
     countries = json.loads(resource_string(__name__, "resources/countries.geojson"))
-    geom = None
+    index = {}
     for feature in countries["features"]:
         name = feature["properties"]["ADMIN"]
         code = feature["properties"]["ISO_A3"]
-        if country.lower() in (name.lower(), code.lower()):
-            geom = shape(feature["geometry"])
+        index[name.lower()] = feature["geometry"]
+        index[code.lower()] = feature["geometry"]
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def country_geometry(country):
+    """Get the shapely geometry corresponding to a given country
+    identified by its name or its three-letters ISO A3 Code.
+
+    Results are memoized: the world countries GeoJSON is only parsed on
+    the first call for a given country.
+    """
+    geom = _country_index().get(country.lower())
     if not geom:
         raise ValueError("Country not found.")
-    return geom
+    return shape(geom)
+
+
+def _open_stream(session, url, resume_pos):
+    """Open a streaming GET request with an optional byte range offset.
+
+    Falls back to a full download from scratch when the server does not
+    honor the Range header (e.g. 416 or a plain 200 with the full body).
+    """
+    headers = {"Range": f"bytes={resume_pos}-"} if resume_pos else {}
+    r = session.get(url, stream=True, timeout=5, headers=headers)
+    if resume_pos and r.status_code != 206:
+        log.info("Cannot resume download. Restarting from zero.")
+        r.close()
+        resume_pos = 0
+        r = session.get(url, stream=True, timeout=5)
+    return r, resume_pos
+
+
+def _progress_bar(filename, remote_size, r, resume_pos, position):
+    """Create a download progress bar starting at the resume offset.
+
+    The total is taken from the HEAD probe when available, otherwise from
+    the response Content-Length header (None if the server advertises
+    neither).
+    """
+    total = remote_size
+    if total is None:
+        content_length = r.headers.get("Content-Length")
+        total = int(content_length) if content_length else None
+    bar_format = "{desc} | {percentage:3.0f}% | {rate_fmt}"
+    return tqdm(
+        desc=filename,
+        bar_format=bar_format,
+        total=total,
+        initial=resume_pos,
+        unit_scale=True,
+        unit="B",
+        leave=True,
+        position=position,
+    )
+
+
+def _stream_to_file(r, local_path, resume_pos, progress_bar=None):
+    """Stream a response body to disk, appending when resuming."""
+    with open(local_path, "ab" if resume_pos else "wb") as f:
+        # 1 MiB chunks to avoid one Python iteration per KB downloaded
+        for chunk in r.iter_content(chunk_size=1024 * 1024):
+            if chunk:
+                f.write(chunk)
+                # Explicit None check: bool(tqdm) is undefined with total=None
+                if progress_bar is not None:
+                    progress_bar.update(len(chunk))
+    if progress_bar is not None:
+        if progress_bar.total:
+            progress_bar.n = progress_bar.total
+        progress_bar.close()
 
 
 def download_from_url(
@@ -107,48 +179,45 @@ def download_from_url(
     filename = url.split("/")[-1]
     local_path = os.path.join(output_dir, filename)
 
-    with session.get(url, stream=True, timeout=5) as r:
-
-        try:
-            r.raise_for_status()
-        except Exception as e:
-            log.error(e)
-
-        # Remove old file if overwrite
-        if os.path.isfile(local_path) and overwrite:
-            log.info(f"Removing old {filename} file.")
-            os.remove(local_path)
+    # Remove old file if overwrite
+    if os.path.isfile(local_path) and overwrite:
+        log.info(f"Removing old {filename} file.")
+        os.remove(local_path)
 
-        # Skip download if remote and local sizes are equal
-        if http_same_size(session, url, local_path):
+    # The remote size is only probed when a local file exists: skip the
+    # download if both sizes are equal, resume it if the local file is
+    # smaller. Resuming is disabled when the server does not advertise a
+    # Content-Length.
+    remote_size, resume_pos = None, 0
+    if os.path.isfile(local_path):
+        remote_size = size_from_url(session, url)
+        local_size = os.path.getsize(local_path)
+        if local_size == remote_size:
             log.info(
                 f"Remote and local sizes of {filename} are equal. Skipping download."
             )
             return local_path
+        if remote_size and local_size < remote_size:
+            log.info(f"Resuming download of {filename} at byte {local_size}.")
+            resume_pos = local_size
+
+    r, resume_pos = _open_stream(session, url, resume_pos)
+
+    with r:
+
+        try:
+            r.raise_for_status()
+        except Exception as e:
+            log.error(e)
 
         # Setup progress bar
+        progress_bar = None
         if show_progress:
-            size = int(r.headers.get("Content-Length"))
-            bar_format = "{desc} | {percentage:3.0f}% | {rate_fmt}"
-            progress_bar = tqdm(
-                desc=filename,
-                bar_format=bar_format,
-                total=size,
-                unit_scale=True,
-                unit="B",
-                leave=True,
-                position=pbar_position,
+            progress_bar = _progress_bar(
+                filename, remote_size, r, resume_pos, pbar_position
             )
 
-        with open(local_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024):
-                if chunk:
-                    f.write(chunk)
-                    if show_progress:
-                        progress_bar.update(1024)
-        if show_progress:
-            progress_bar.n = progress_bar.total
-            progress_bar.close()
+        _stream_to_file(r, local_path, resume_pos, progress_bar)
 
     filesize = human_readable_size(os.path.getsize(local_path))
     log.info(f"Downloaded file {filename} ({filesize}).")
@@ -252,11 +321,10 @@ def unzip(src, dst_dir=None):
 
 def unzip_all(src_dir, remove_archives=False):
     """Unzip all .zip files in a directory."""
-    filenames = os.listdir(src_dir)
-    filenames = [f for f in filenames if f.endswith(".zip")]
+    with os.scandir(src_dir) as entries:
+        filenames = [e.path for e in entries if e.name.endswith(".zip")]
     progress = tqdm(total=len(filenames))
     for filename in filenames:
-        filename = os.path.join(src_dir, filename)
         unzip(filename)
         if remove_archives:
             os.remove(filename)
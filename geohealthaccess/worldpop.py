@@ -179,7 +179,8 @@ def clean_datadir(directory):
     directory : str
         Path to directory to check.
     """
-    rasters = [f for f in os.listdir(directory) if f.lower().endswith(".tif")]
+    with os.scandir(directory) as entries:
+        rasters = [e.name for e in entries if e.name.lower().endswith(".tif")]
     if len(rasters) <= 1:
         log.info("Data directory does not require cleaning.")
         return
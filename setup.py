@@ -32,7 +32,7 @@ setup(
         "appdirs",
         "click",
     ],
-    extras_require={"dev": ["pytest", "pytest-cov"]},
+    extras_require={"dev": ["pytest", "pytest-cov"], "speedups": ["numba", "pyogrio"]},
     package_data={
         "geohealthaccess": [
             "resources/*.geojson",